@@ -12,6 +12,8 @@ This implementation incorporates methodological improvements for multimedia buff
 """
 
 import asyncio
+import bisect
+import functools
 import json
 import subprocess
 import sys
@@ -62,17 +64,16 @@ class FileAccessCoordinator:
 # Create a global file coordinator instance
 file_coordinator = FileAccessCoordinator()
 
-async def atomic_file_write(path, content):
-    """Write content to a file atomically using a temporary file."""
+# Directories already created by atomic_file_write, so each is only made once
+created_directories = set()
+
+def _write_file_atomically(path, content):
+    """Blocking part of atomic_file_write: write a temporary file and rename it into place."""
     temp_path = f"{path}.tmp"
-    
-    # Ensure parent directory exists
-    parent_dir = os.path.dirname(path)
-    os.makedirs(parent_dir, exist_ok=True)
-    
     try:
-        async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
-            await f.write(content)
+        # Encode once and write bytes, bypassing the TextIOWrapper layer
+        with open(temp_path, "wb") as f:
+            f.write(content.encode("utf-8"))
         os.replace(temp_path, path)  # Atomic operation on most file systems
     except Exception as e:
         if os.path.exists(temp_path):
@@ -82,6 +83,17 @@ async def atomic_file_write(path, content):
                 pass  # Best effort cleanup, ignore errors during cleanup
         raise e
 
+async def atomic_file_write(path, content):
+    """Write content to a file atomically using a temporary file."""
+    # Ensure parent directory exists
+    parent_dir = os.path.dirname(path)
+    if parent_dir not in created_directories:
+        os.makedirs(parent_dir, exist_ok=True)
+        created_directories.add(parent_dir)
+    
+    # Open, write, close and rename in one worker-thread hop instead of one per aiofiles call
+    await asyncio.to_thread(_write_file_atomically, path, content)
+
 async def atomic_file_write_with_retry(path, content, max_retries=3, retry_delay=0.5):
     """Write content to a file atomically with retries for resilience."""
     last_error = None
@@ -163,10 +175,21 @@ WINDOW_SIZE = int(os.environ.get("WINDOW_SIZE", "12"))
 DEBUG_MESSAGES = os.environ.get("DEBUG_MESSAGES", "false").lower() == "true"
 
 # Constants for multimedia buffer initialization
-REQUIRED_BUFFER_SEGMENTS = 6  # Number of segments required before stream initialization
-SEGMENT_BUFFER_SECONDS = SEGMENT_DURATION * REQUIRED_BUFFER_SEGMENTS  # 60 seconds with 10-second segments
+REQUIRED_BUFFER_SEGMENTS = int(os.environ.get("REQUIRED_BUFFER_SEGMENTS", "6"))  # Number of segments required before stream initialization
+SEGMENT_BUFFER_SECONDS = SEGMENT_DURATION * REQUIRED_BUFFER_SEGMENTS  # Startup delay (60 seconds with the defaults)
 TRANSCRIPTION_BUFFER_MIN = 3  # Minimum number of transcriptions needed (relaxed from 6 to ensure startup)
 
+# Subtitle track names; the track list is fixed, so its master playlist entries are built once
+LANG_NAMES = {"ru": "Russian", "en": "English", "nl": "Dutch"}
+MASTER_PLAYLIST_SUBTITLE_TRACKS = "".join(
+    f'#EXT-X-MEDIA:TYPE=SUBTITLES,GROUP-ID="subs",NAME="{name}",DEFAULT={"YES" if lang == "ru" else "NO"},AUTOSELECT=YES,'
+    f'FORCED=NO,LANGUAGE="{lang}",URI="subtitles/{lang}/playlist.m3u8",CHARACTERISTICS="public.accessibility.transcribes-spoken-dialog"\n'
+    for lang, name in LANG_NAMES.items()
+)
+
+# Media playlist entry, formatted with (segment number, extension)
+PLAYLIST_ENTRY_TEMPLATE = f"#EXTINF:{SEGMENT_DURATION}.0,\nsegment{{}}.{{}}\n"
+
 # Directory structure
 HLS_OUTPUT_DIR = OUTPUT_DIR
 VIDEO_DIR = os.path.join(HLS_OUTPUT_DIR, "video")
@@ -181,6 +204,15 @@ SERVING_AUDIO_DIR = os.path.join(SERVING_DIR, "audio")
 SERVING_SUBTITLE_BASE_DIR = os.path.join(SERVING_DIR, "subtitles")
 
 # === Global State Management ===
+class CaptionCue:
+    """A caption with stream-relative start/end times in seconds."""
+    __slots__ = ("start", "end", "text")  # No per-cue __dict__; thousands are kept in memory
+    
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
 # Caption storage with controlled memory usage (prevents memory leaks for 24/7 operation)
 MAX_CUES_PER_LANGUAGE = 1000
 caption_cues = {
@@ -188,6 +220,12 @@ caption_cues = {
     "en": deque(maxlen=MAX_CUES_PER_LANGUAGE),  # English translations
     "nl": deque(maxlen=MAX_CUES_PER_LANGUAGE)   # Dutch translations
 }
+# Longest cue seen per language, used to bound binary searches over caption_cues
+max_cue_duration = {lang: 0.0 for lang in caption_cues}
+# Bumped whenever a language's cue set changes, so cached VTT segments can be reused
+caption_versions = {lang: 0 for lang in caption_cues}
+# Last (caption version, content) written per (language, segment number)
+vtt_segment_cache = {}
 
 # Process and timing management
 ffmpeg_processes = {}
@@ -281,6 +319,15 @@ def get_gladia_key() -> str:
         sys.exit(1)
     return sys.argv[1]
 
+@functools.lru_cache(maxsize=4096)
+def _format_hms(whole_seconds: int) -> str:
+    """Format whole seconds as HH:MM:SS; cached because cue times repeat within segments."""
+    hours, whole_seconds = divmod(whole_seconds, 3600)
+    minutes, secs = divmod(whole_seconds, 60)
+    
+    # Keep hours reasonable for WebVTT (max 99)
+    return "%02d:%02d:%02d" % (hours % 100, minutes, secs)
+
 def format_duration(seconds: float) -> str:
     """Format seconds into WebVTT time format: HH:MM:SS.mmm"""
     try:
@@ -290,16 +337,8 @@ def format_duration(seconds: float) -> str:
                 parts = seconds.split(":")
                 seconds = float(parts[-2]) * 60 + float(parts[-1])
         
-        milliseconds = int(float(seconds) * 1000)
-        hours = milliseconds // 3600000
-        minutes = (milliseconds % 3600000) // 60000
-        secs = (milliseconds % 60000) // 1000
-        ms = milliseconds % 1000
-        
-        # Keep hours reasonable for WebVTT (max 99)
-        hours = hours % 100
-        
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:03d}"
+        whole_seconds, ms = divmod(int(float(seconds) * 1000), 1000)
+        return "%s.%03d" % (_format_hms(whole_seconds), ms)
     except (ValueError, TypeError) as e:
         system_logger.error(f"Invalid timestamp value: {seconds}. Error: {e}")
         return "00:00:00.000"
@@ -338,6 +377,52 @@ def get_segment_timestamp(segment_number: int) -> float:
     normalized_segment = normalize_segment_number(segment_number)
     return normalized_segment * SEGMENT_DURATION
 
+def parse_video_playlist(content: str):
+    """
+    Parse an FFmpeg HLS playlist into its media sequence and segment numbers.
+    Segments are returned in playlist order, i.e. ascending, so callers can take
+    the oldest and newest from the ends of the list instead of scanning it.
+    """
+    media_sequence = 0
+    segments = []
+    for line in content.splitlines():
+        line = line.strip()
+        if line.endswith(".ts"):
+            # Segment entries are fixed-shape "segment<number>.ts" names
+            segments.append(int(line[7:-3]))
+        elif line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+            media_sequence = int(line[22:])
+    return media_sequence, segments
+
+def build_media_playlist(media_sequence, segments, extension):
+    """Build a media playlist listing the given segment numbers."""
+    header = (
+        "#EXTM3U\n#EXT-X-VERSION:3\n"
+        "#EXT-X-INDEPENDENT-SEGMENTS\n"
+        f"#EXT-X-TARGETDURATION:{SEGMENT_DURATION}\n"
+        f"#EXT-X-MEDIA-SEQUENCE:{media_sequence}\n"
+    )
+    return header + "".join([PLAYLIST_ENTRY_TEMPLATE.format(seg_num, extension) for seg_num in segments])
+
+# Last video playlist text and its parsed result; FFmpeg only rewrites it once per segment
+_video_playlist_cache = (None, (0, []))
+
+async def read_video_playlist():
+    """
+    Read the video playlist and return its media sequence and segment numbers.
+    The result is reused while the playlist text is unchanged, so callers must not modify it.
+    """
+    global _video_playlist_cache
+    
+    async with aiofiles.open(os.path.join(VIDEO_DIR, "playlist.m3u8"), 'r') as f:
+        content = await f.read()
+    
+    cached_content, parsed = _video_playlist_cache
+    if content != cached_content:
+        parsed = parse_video_playlist(content)
+        _video_playlist_cache = (content, parsed)
+    return parsed
+
 def cleanup_old_directories():
     """Clean up old output directories to start fresh."""
     try:
@@ -346,6 +431,7 @@ def cleanup_old_directories():
             if os.path.exists(dir_path):
                 shutil.rmtree(dir_path)
                 system_logger.info(f"Cleaned up directory: {dir_path}")
+        created_directories.clear()
     except Exception as e:
         system_logger.error(f"Error cleaning up directories: {e}")
 
@@ -365,6 +451,25 @@ def ensure_directories_exist():
     for lang in caption_cues.keys():
         os.makedirs(os.path.join(SERVING_SUBTITLE_BASE_DIR, lang), exist_ok=True)
 
+async def drain_ffmpeg_stderr(process, name, recent_lines):
+    """
+    Read an FFmpeg process's stderr line by line until it closes.
+    Keeps the pipe from filling up and stalling FFmpeg; the last lines are kept in
+    recent_lines for error reports. Binary pipes only split on "\n", so FFmpeg must
+    run with -nostats (or a text-mode pipe) to avoid "\r"-terminated progress output
+    piling up as one unbounded line.
+    """
+    while True:
+        line = await asyncio.to_thread(process.stderr.readline)
+        if not line:
+            break
+        if isinstance(line, bytes):
+            line = line.decode(errors="replace")
+        line = line.strip()
+        recent_lines.append(line)
+        if DEBUG_MESSAGES:
+            system_logger.debug(f"FFmpeg ({name}): {line}")
+
 # === Transcription Processing ===
 async def stream_audio_to_gladia(websocket: WebSocketClientProtocol) -> None:
     """
@@ -376,6 +481,7 @@ async def stream_audio_to_gladia(websocket: WebSocketClientProtocol) -> None:
     # FFmpeg command optimized for real-time streaming to Gladia
     ffmpeg_command = [
         "ffmpeg", "-re",
+        "-nostats", "-loglevel", "warning",  # No "\r" progress lines on the binary stderr pipe
         "-i", STREAM_URL,
         "-ar", str(STREAMING_CONFIGURATION["sample_rate"]),
         "-ac", str(STREAMING_CONFIGURATION["channels"]),
@@ -396,6 +502,10 @@ async def stream_audio_to_gladia(websocket: WebSocketClientProtocol) -> None:
     
     ffmpeg_processes["gladia_audio"] = process
     
+    # Drain stderr in the background; it is otherwise never read while audio flows
+    recent_stderr = deque(maxlen=20)
+    stderr_task = asyncio.create_task(drain_ffmpeg_stderr(process, "audio", recent_stderr))
+    
     try:
         # Skip WAV header (44 bytes)
         header = process.stdout.read(44)
@@ -404,9 +514,9 @@ async def stream_audio_to_gladia(websocket: WebSocketClientProtocol) -> None:
             # Stream raw audio data directly
             audio_chunk = process.stdout.read(4096)  # Use larger chunks for efficiency
             if not audio_chunk:
-                stderr = process.stderr.read()
-                if stderr:
-                    system_logger.error(f"FFmpeg audio streaming error: {stderr.decode()}")
+                await stderr_task  # FFmpeg has exited, so its stderr is about to close
+                if recent_stderr:
+                    system_logger.error(f"FFmpeg audio streaming error: {' | '.join(recent_stderr)}")
                 break
             
             try:
@@ -430,6 +540,10 @@ async def stream_audio_to_gladia(websocket: WebSocketClientProtocol) -> None:
         if process and process.poll() is None:
             process.terminate()
             system_logger.info("Terminated direct audio streaming process")
+        
+        # Stop waiting on stderr; the reader thread ends once the terminated process closes the pipe
+        if not stderr_task.done():
+            stderr_task.cancel()
 
 async def process_transcription_messages(websocket: WebSocketClientProtocol) -> None:
     """
@@ -562,16 +676,22 @@ async def store_caption_cue(language, start_time, end_time, text):
             transcription_logger.warning(f"Invalid timestamps: {start_time} -> {end_time}, adjusting end time")
             end_time = start_time + 1.0  # Ensure at least 1 second duration
         
-        # Add to in-memory caption store
-        caption_cues[language].append({
-            "start": start_time,
-            "end": end_time,
-            "text": text
-        })
+        # Add to in-memory caption store, keeping it ordered by start time
+        cues = caption_cues[language]
+        cue = CaptionCue(start_time, end_time, text)
+        if not cues or cues[-1].start <= start_time:
+            cues.append(cue)  # Common in-order case; maxlen evicts the oldest cue
+        else:
+            if len(cues) == cues.maxlen:
+                cues.popleft()  # A full deque rejects insert(), so evict the oldest cue first
+            bisect.insort(cues, cue, key=lambda cue: cue.start)
+        max_cue_duration[language] = max(max_cue_duration[language], end_time - start_time)
+        caption_versions[language] += 1
         
         # Log caption storage for debugging
-        transcription_logger.debug(f"Stored {language} caption: {format_duration(start_time)} -> {format_duration(end_time)}: {text[:30]}...")
-        transcription_logger.debug(f"Total {language} captions in memory: {len(caption_cues[language])}")
+        if transcription_logger.isEnabledFor(logging.DEBUG):
+            transcription_logger.debug(f"Stored {language} caption: {format_duration(start_time)} -> {format_duration(end_time)}: {text[:30]}...")
+            transcription_logger.debug(f"Total {language} captions in memory: {len(caption_cues[language])}")
         
         # For any existing segments that might contain this caption, update their VTT files
         if first_segment_timestamp is not None:
@@ -590,28 +710,26 @@ async def update_overlapping_vtt_segments(language, start_time, end_time):
             transcription_logger.warning(f"Video playlist not found, cannot update VTT segments")
             return
         
-        current_segments = []
-        async with aiofiles.open(video_playlist_path, 'r') as f:
-            content = await f.read()
-            for line in content.splitlines():
-                if line.strip().endswith(".ts"):
-                    seg_num = int(line.strip().replace("segment", "").replace(".ts", ""))
-                    current_segments.append(seg_num)
+        media_sequence, current_segments = await read_video_playlist()
         
         if not current_segments:
             transcription_logger.warning(f"No segments found in playlist, cannot update VTT segments")
             return
             
-        transcription_logger.debug(f"Found {len(current_segments)} current segments: {current_segments}")
-        transcription_logger.debug(f"Checking for segments overlapping with caption: {format_duration(start_time)} -> {format_duration(end_time)}")
+        # Checked once so the per-segment debug strings below are only built when emitted
+        debug_enabled = transcription_logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            transcription_logger.debug(f"Found {len(current_segments)} current segments: {current_segments}")
+            transcription_logger.debug(f"Checking for segments overlapping with caption: {format_duration(start_time)} -> {format_duration(end_time)}")
         
         # For each segment, check if it overlaps with the caption timespan
-        segments_updated = []
+        overlapping_segments = []
         for seg_num in current_segments:
             segment_start = (seg_num - first_segment_timestamp) * SEGMENT_DURATION
             segment_end = segment_start + SEGMENT_DURATION
             
-            transcription_logger.debug(f"Checking segment {seg_num}: {format_duration(segment_start)} -> {format_duration(segment_end)}")
+            if debug_enabled:
+                transcription_logger.debug(f"Checking segment {seg_num}: {format_duration(segment_start)} -> {format_duration(segment_end)}")
             
             # Check for overlap with caption timespan (use more flexible matching)
             if (start_time >= segment_start - 5 and start_time < segment_end + 5) or \
@@ -620,13 +738,17 @@ async def update_overlapping_vtt_segments(language, start_time, end_time):
                 
                 transcription_logger.debug(f"Found overlap! Updating {language} segment {seg_num}")
                 # This segment needs to be updated
-                success = await create_vtt_segment(seg_num, language)
-                if success:
-                    segments_updated.append(seg_num)
+                overlapping_segments.append(seg_num)
+        
+        # Rebuild the overlapping segments concurrently; each writes its own file
+        results = await asyncio.gather(
+            *(create_vtt_segment(seg_num, language) for seg_num in overlapping_segments)
+        )
+        segments_updated = [seg_num for seg_num, success in zip(overlapping_segments, results) if success]
         
         # If no segments were updated due to the flexible matching, update the latest segment as fallback
         if not segments_updated and current_segments:
-            latest_segment = max(current_segments)
+            latest_segment = current_segments[-1]
             transcription_logger.info(f"No overlapping segments found, updating latest segment {latest_segment} as fallback")
             await create_vtt_segment(latest_segment, language)
             segments_updated.append(latest_segment)
@@ -634,7 +756,7 @@ async def update_overlapping_vtt_segments(language, start_time, end_time):
         # Update the subtitle playlist after any changes
         if segments_updated:
             transcription_logger.debug(f"Updated segments {segments_updated}, updating subtitle playlist")
-            await update_subtitle_playlist(language)
+            await update_subtitle_playlist(language, (media_sequence, current_segments))
         else:
             transcription_logger.warning(f"No segments were updated for caption at {format_duration(start_time)}")
     
@@ -715,23 +837,12 @@ async def create_hls_stream():
         # Create initial master playlist
         await create_master_playlist()
         
-        # Monitor FFmpeg output in real-time
-        while True:
-            line = process.stderr.readline()
-            if not line and process.poll() is not None:
-                system_logger.error("FFmpeg process ended unexpectedly")
-                raise RuntimeError("FFmpeg process failed")
-            if line:
-                if DEBUG_MESSAGES:
-                    system_logger.debug(f"FFmpeg: {line.strip()}")
-            
-            # Check if FFmpeg process has failed
-            if process.poll() is not None:
-                stderr = process.stderr.read()
-                system_logger.error(f"FFmpeg process failed: {stderr}")
-                break
-            
-            await asyncio.sleep(0.1)
+        # Monitor FFmpeg output in real-time; this returns only once FFmpeg exits
+        recent_stderr = deque(maxlen=20)
+        await drain_ffmpeg_stderr(process, "hls", recent_stderr)
+        await asyncio.to_thread(process.wait)
+        system_logger.error(f"FFmpeg process ended unexpectedly: {' | '.join(recent_stderr)}")
+        raise RuntimeError("FFmpeg process failed")
     
     except Exception as e:
         system_logger.error(f"Error in HLS stream generation: {e}")
@@ -747,28 +858,21 @@ async def create_master_playlist():
     """Create the master playlist with subtitle tracks."""
     master_playlist_path = os.path.join(HLS_OUTPUT_DIR, "master.m3u8")
     
-    # Create subtitle directories
-    for lang in caption_cues.keys():
-        subtitle_dir = os.path.join(SUBTITLE_BASE_DIR, lang)
-        os.makedirs(subtitle_dir, exist_ok=True)
-    
     # Build the master playlist content
-    content = "#EXTM3U\n#EXT-X-VERSION:3\n"
-    content += "#EXT-X-INDEPENDENT-SEGMENTS\n"
-    
-    # Audio track
-    content += '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="audio",NAME="Audio",DEFAULT=YES,AUTOSELECT=YES,URI="audio/playlist.m3u8"\n\n'
+    content_parts = [
+        "#EXTM3U\n#EXT-X-VERSION:3\n",
+        "#EXT-X-INDEPENDENT-SEGMENTS\n",
+        # Audio track
+        '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="audio",NAME="Audio",DEFAULT=YES,AUTOSELECT=YES,URI="audio/playlist.m3u8"\n\n',
+    ]
     
     # Subtitle tracks with explicit MIME type
-    lang_names = {"ru": "Russian", "en": "English", "nl": "Dutch"}
-    for lang, name in lang_names.items():
-        default = "YES" if lang == "ru" else "NO"
-        content += f'#EXT-X-MEDIA:TYPE=SUBTITLES,GROUP-ID="subs",NAME="{name}",DEFAULT={default},AUTOSELECT=YES,' + \
-                  f'FORCED=NO,LANGUAGE="{lang}",URI="subtitles/{lang}/playlist.m3u8",CHARACTERISTICS="public.accessibility.transcribes-spoken-dialog"\n'
+    content_parts.append(MASTER_PLAYLIST_SUBTITLE_TRACKS)
     
     # Add stream info with explicit subtitle codecs
-    content += '\n#EXT-X-STREAM-INF:BANDWIDTH=2500000,CODECS="avc1.64001f,mp4a.40.2,wvtt",AUDIO="audio",SUBTITLES="subs"\n'
-    content += 'video/playlist.m3u8\n'
+    content_parts.append('\n#EXT-X-STREAM-INF:BANDWIDTH=2500000,CODECS="avc1.64001f,mp4a.40.2,wvtt",AUDIO="audio",SUBTITLES="subs"\n')
+    content_parts.append('video/playlist.m3u8\n')
+    content = "".join(content_parts)
     
     # Write master playlist with retries
     await atomic_file_write_with_retry(master_playlist_path, content)
@@ -786,17 +890,35 @@ async def create_vtt_segment(segment_number, language="ru"):
         segment_start_time = (segment_number - first_segment_timestamp) * SEGMENT_DURATION
         segment_end_time = segment_start_time + SEGMENT_DURATION
         
-        transcription_logger.debug(f"Creating {language} VTT for segment {segment_number}")
-        transcription_logger.debug(f"Segment time window: {format_duration(segment_start_time)} -> {format_duration(segment_end_time)}")
+        # Nothing to rebuild if no captions were added since this segment was last written
+        cache_key = (language, segment_number)
+        caption_version = caption_versions[language]
+        cached = vtt_segment_cache.get(cache_key)
+        if cached is not None and cached[0] == caption_version:
+            return True
         
-        content = "WEBVTT\n\n"
+        # Checked once so the per-cue debug strings below are only built when emitted
+        debug_enabled = transcription_logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            transcription_logger.debug(f"Creating {language} VTT for segment {segment_number}")
+            transcription_logger.debug(f"Segment time window: {format_duration(segment_start_time)} -> {format_duration(segment_end_time)}")
+        
+        content_parts = ["WEBVTT\n\n"]
         cue_index = 1
         
-        # Find cues that overlap with this segment's time window
-        for cue in caption_cues[language]:
+        # Find cues that overlap with this segment's time window. Cues are sorted
+        # by start time, so skip straight past those that end before the window.
+        cues = caption_cues[language]
+        first_index = bisect.bisect_left(
+            cues, segment_start_time - max_cue_duration[language], key=lambda cue: cue.start
+        )
+        for i in range(first_index, len(cues)):
+            cue = cues[i]
+            if cue.start >= segment_end_time:
+                break  # Every remaining cue starts after this segment
             try:
-                cue_start = float(cue["start"])
-                cue_end = float(cue["end"])
+                cue_start = cue.start
+                cue_end = cue.end
                 
                 # Skip invalid cues
                 if cue_end <= cue_start:
@@ -804,33 +926,35 @@ async def create_vtt_segment(segment_number, language="ru"):
                     continue
                 
                 # Strict overlap check - the cue must actually overlap with this segment
-                if cue_start < segment_end_time and cue_end > segment_start_time:
-                    # Calculate relative timing and clamp to segment boundaries
+                # (cues starting after the segment end were already cut off above)
+                if cue_end > segment_start_time:
+                    # Relative timing clamped to the segment, which also covers cues
+                    # carrying over from the previous segment or into the next one
                     relative_start = max(0.0, cue_start - segment_start_time)
-                    relative_end = min(SEGMENT_DURATION, cue_end - segment_start_time)
+                    relative_end = min(float(SEGMENT_DURATION), cue_end - segment_start_time)
                     
-                    # Handle case where cue carries over from previous segment
-                    if cue_start < segment_start_time:
-                        relative_start = 0.0
+                    if debug_enabled:
+                        transcription_logger.debug(f"Adding cue: {format_duration(relative_start)} -> {format_duration(relative_end)}")
+                        transcription_logger.debug(f"Text: {cue.text}")
                     
-                    # Handle case where cue carries over to next segment
-                    if cue_end > segment_end_time:
-                        relative_end = float(SEGMENT_DURATION)
-                    
-                    transcription_logger.debug(f"Adding cue: {format_duration(relative_start)} -> {format_duration(relative_end)}")
-                    transcription_logger.debug(f"Text: {cue['text']}")
-                    
-                    content += f"{cue_index}\n"
-                    content += f"{format_duration(relative_start)} --> {format_duration(relative_end)}\n"
-                    content += f"{cue['text']}\n\n"
+                    content_parts.append(f"{cue_index}\n{format_duration(relative_start)} --> {format_duration(relative_end)}\n{cue.text}\n\n")
                     cue_index += 1
-            except (ValueError, KeyError) as e:
+            except (ValueError, AttributeError) as e:
                 transcription_logger.error(f"Error processing cue: {e}")
                 continue
         
+        content = "".join(content_parts)
+        
+        # Skip the write when this segment's captions have not changed
+        if cached is not None and cached[1] == content:
+            transcription_logger.debug(f"{language} segment {segment_number} unchanged, skipping write")
+            vtt_segment_cache[cache_key] = (caption_version, content)
+            return True
+        
         # Write the segment file atomically
         segment_path = os.path.join(SUBTITLE_BASE_DIR, language, f"segment{segment_number}.vtt")
         await atomic_file_write_with_retry(segment_path, content)
+        vtt_segment_cache[cache_key] = (caption_version, content)
             
         transcription_logger.debug(f"Created {language} segment {segment_number} with {cue_index-1} cues")
         return True
@@ -839,40 +963,28 @@ async def create_vtt_segment(segment_number, language="ru"):
         transcription_logger.error(f"Error in create_vtt_segment: {str(e)}")
         return False
 
-async def update_subtitle_playlist(language="ru"):
+async def update_subtitle_playlist(language="ru", video_playlist_state=None):
     """
     Update the subtitle playlist for the given language.
     Ensures subtitle segments match video segments exactly.
+    Callers that have just read the video playlist can pass its
+    (media_sequence, segments) as video_playlist_state to avoid re-reading it.
     """
-    subtitle_dir = os.path.join(SUBTITLE_BASE_DIR, language)
-    os.makedirs(subtitle_dir, exist_ok=True)
-    playlist_path = os.path.join(subtitle_dir, "playlist.m3u8")
+    # Subtitle directories are created once by ensure_directories_exist()
+    playlist_path = os.path.join(SUBTITLE_BASE_DIR, language, "playlist.m3u8")
 
     # Get video playlist state - this is critical for synchronization
-    video_playlist = os.path.join(VIDEO_DIR, "playlist.m3u8")
     media_sequence = 0
     segments = []
     
-    if os.path.exists(video_playlist):
-        async with aiofiles.open(video_playlist, 'r') as f:
-            content = await f.read()
-            for line in content.splitlines():
-                if line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
-                    media_sequence = int(line.strip().split(":")[1])
-                elif line.strip().endswith(".ts"):
-                    seg_num = int(line.strip().replace("segment", "").replace(".ts", ""))
-                    segments.append(seg_num)
-
-    # Create matching subtitle playlist with EXACTLY the same segments as video
-    content = "#EXTM3U\n#EXT-X-VERSION:3\n"
-    content += "#EXT-X-INDEPENDENT-SEGMENTS\n"  # Add independent segments directive
-    content += f"#EXT-X-TARGETDURATION:{SEGMENT_DURATION}\n"
-    content += f"#EXT-X-MEDIA-SEQUENCE:{media_sequence}\n"
-
-    # Ensure we reference the exact same segments in the same order as video playlist
-    for seg_num in segments:
-        content += f"#EXTINF:{SEGMENT_DURATION}.0,\n"
-        content += f"segment{seg_num}.vtt\n"
+    if video_playlist_state is not None:
+        media_sequence, segments = video_playlist_state
+    elif os.path.exists(os.path.join(VIDEO_DIR, "playlist.m3u8")):
+        media_sequence, segments = await read_video_playlist()
+
+    # Create matching subtitle playlist with EXACTLY the same segments as video,
+    # in the same order as the video playlist
+    content = build_media_playlist(media_sequence, segments, "vtt")
 
     # Write playlist atomically with retries
     await atomic_file_write_with_retry(playlist_path, content)
@@ -888,6 +1000,8 @@ async def monitor_segments_and_create_vtt():
     
     retry_count = 0
     max_retries = 10
+    consecutive_errors = 0
+    last_pass_state = None
     
     while True:
         try:
@@ -905,13 +1019,7 @@ async def monitor_segments_and_create_vtt():
             
             retry_count = 0  # Reset retry count when successful
             
-            current_segments = []
-            async with aiofiles.open(video_playlist, 'r') as f:
-                content = await f.read()
-                for line in content.splitlines():
-                    if line.strip().endswith(".ts"):
-                        seg_num = int(line.strip().replace("segment", "").replace(".ts", ""))
-                        current_segments.append(seg_num)
+            media_sequence, current_segments = await read_video_playlist()
             
             # Proceed only when segment data is available for synchronization
             if not current_segments:
@@ -921,7 +1029,7 @@ async def monitor_segments_and_create_vtt():
             
             # Initialize first_segment_timestamp if not set
             if first_segment_timestamp is None and current_segments:
-                first_segment_timestamp = min(current_segments)
+                first_segment_timestamp = current_segments[0]
                 system_logger.info(f"Initialized first_segment_timestamp to {first_segment_timestamp}")
                 
                 # Important: Synchronize timing references
@@ -931,6 +1039,18 @@ async def monitor_segments_and_create_vtt():
                     system_logger.info(f"Initialized segment_time_offset to 0 for simplified timestamp normalization")
                     system_logger.info(f"Transcription start time: {transcription_start_time}, First segment: {first_segment_timestamp}")
             
+            # Skip the pass when neither the playlist nor any captions changed since the last clean pass
+            pass_state = (
+                media_sequence,
+                tuple(current_segments),
+                tuple(caption_versions.values()),
+                initialization_complete,
+            )
+            if pass_state == last_pass_state:
+                consecutive_errors = 0
+                await asyncio.sleep(1)
+                continue
+            
             system_logger.info(f"Current segments: {current_segments}")
             system_logger.info(f"Processed segments: {processed_segments}")
             
@@ -940,6 +1060,8 @@ async def monitor_segments_and_create_vtt():
                 system_logger.info("Periodic full update of all subtitle segments")
             
             # Process new or updated segments
+            updated_languages = set()
+            pass_successful = True
             for seg_num in current_segments:
                 if seg_num not in processed_segments or force_update_all:
                     if seg_num not in processed_segments:
@@ -947,16 +1069,18 @@ async def monitor_segments_and_create_vtt():
                     else:
                         system_logger.info(f"Refreshing segment: {seg_num}")
                     
-                    # Create VTT segments for all languages
-                    all_successful = True
-                    for lang in caption_cues.keys():
-                        success = await create_vtt_segment(seg_num, lang)
-                        if success:
-                            await update_subtitle_playlist(lang)
-                        else:
-                            all_successful = False
+                    # Create VTT segments for all languages concurrently so their writes overlap
+                    results = await asyncio.gather(
+                        *(create_vtt_segment(seg_num, lang) for lang in caption_cues.keys())
+                    )
+                    all_successful = all(results)
+                    pass_successful = pass_successful and all_successful
+                    updated_languages.update(
+                        lang for lang, success in zip(caption_cues.keys(), results) if success
+                    )
                     
-                    if seg_num not in processed_segments:
+                    # Only mark the segment done once every language built, so failures are retried
+                    if all_successful:
                         processed_segments.add(seg_num)
                     
                     # Validate buffer initialization criteria prior to service commencement
@@ -965,16 +1089,40 @@ async def monitor_segments_and_create_vtt():
                             ready_to_serve = True
                             system_logger.info(f"Buffer initialization complete: {len(processed_segments)} segments with synchronized transcriptions")
             
+            # Update each changed subtitle playlist once, from the video playlist read above
+            for lang in updated_languages:
+                await update_subtitle_playlist(lang, (media_sequence, current_segments))
+            
             # Clean up old segments
             if current_segments:
-                min_segment = min(current_segments)
+                min_segment = current_segments[0]
                 processed_segments = {s for s in processed_segments if s >= min_segment}
+                for cache_key in [k for k in vtt_segment_cache if k[1] < min_segment]:
+                    del vtt_segment_cache[cache_key]
+                
+                # Drop cues that end before the oldest live segment; MAX_CUES_PER_LANGUAGE stays as a hard cap
+                window_start = (min_segment - first_segment_timestamp) * SEGMENT_DURATION
+                for lang, cues in caption_cues.items():
+                    evicted = False
+                    while cues and cues[0].end <= window_start:
+                        cues.popleft()
+                        evicted = True
+                    
+                    # Recompute the bisect bound so an evicted long cue stops widening every lookup
+                    if evicted:
+                        max_cue_duration[lang] = max((cue.end - cue.start for cue in cues), default=0.0)
             
+            # A pass with failed segment builds is never skipped, so those segments
+            # (left out of processed_segments) are rebuilt on the next pass
+            last_pass_state = pass_state if pass_successful else None
+            consecutive_errors = 0
             await asyncio.sleep(1)  # Check every second
             
         except Exception as e:
-            system_logger.error(f"Error in segment monitoring: {str(e)}")
-            await asyncio.sleep(1)
+            consecutive_errors += 1
+            backoff = min(2 ** (consecutive_errors - 1), SEGMENT_DURATION)
+            system_logger.error(f"Error in segment monitoring (retrying in {backoff}s): {str(e)}")
+            await asyncio.sleep(backoff)
 
 # === FastAPI Server ===
 app = FastAPI()
@@ -1292,6 +1440,14 @@ async def transcription_main():
     # Setup logging first
     setup_logging()
     
+    # Buffered segments must still be inside FFmpeg's playlist window, or the drip-feed never starts
+    if not 1 <= REQUIRED_BUFFER_SEGMENTS < WINDOW_SIZE:
+        system_logger.error(
+            f"REQUIRED_BUFFER_SEGMENTS must be at least 1 and less than WINDOW_SIZE ({WINDOW_SIZE}), "
+            f"got {REQUIRED_BUFFER_SEGMENTS}"
+        )
+        sys.exit(1)
+    
     # Clear existing files and create directories
     cleanup_old_directories()
     ensure_directories_exist()
@@ -1356,7 +1512,6 @@ def handle_exit(*args):
 # === Drip-Feed Management ===
 async def ensure_serving_segment_files_exist(segment_number):
     """Ensure video, audio, and VTT files for a segment exist in the serving directory."""
-    all_files_ready = True
     files_to_check = []
 
     # Build list of all required files first
@@ -1380,8 +1535,8 @@ async def ensure_serving_segment_files_exist(segment_number):
             system_logger.warning(f"Source file missing: {source_path}")
             return False
 
-    # If all source files exist, ensure they're in serving directory
-    for source_path, link_path in files_to_check:
+    async def publish_serving_file(source_path, link_path):
+        """Link (or copy) one source file into the serving directory."""
         # Create parent directory if needed
         os.makedirs(os.path.dirname(link_path), exist_ok=True)
 
@@ -1396,12 +1551,17 @@ async def ensure_serving_segment_files_exist(segment_number):
                     system_logger.debug(f"Copied serving file for: {link_path}")
                 except Exception as copy_err:
                     system_logger.error(f"Failed to copy serving file {source_path} to {link_path}: {copy_err}")
-                    all_files_ready = False
+                    return False
             except Exception as link_err:
                 system_logger.error(f"Failed to link serving file {source_path} to {link_path}: {link_err}")
-                all_files_ready = False
+                return False
+        return True
 
-    return all_files_ready
+    # If all source files exist, publish video, audio and every language's VTT concurrently
+    results = await asyncio.gather(
+        *(publish_serving_file(source_path, link_path) for source_path, link_path in files_to_check)
+    )
+    return all(results)
 
 async def manage_drip_feed():
     """
@@ -1417,6 +1577,7 @@ async def manage_drip_feed():
     # Track the first segment we'll serve
     first_serving_segment = min(processed_segments)
     delayed_start_time = time.time()
+    start_monotonic = time.monotonic()
     system_logger.info(f"Starting drip-feed with first segment: {first_serving_segment}")
     
     # Ensure first segment files exist before starting
@@ -1437,14 +1598,16 @@ async def manage_drip_feed():
     # Signal that we're ready to serve
     ready_to_serve = True
     
-    # Drip-feed loop
-    next_segment_time = delayed_start_time + SEGMENT_DURATION
+    # Drip-feed loop, scheduled on the monotonic clock so wall-clock
+    # adjustments (NTP steps) cannot stall or burst the feed
+    next_segment_time = start_monotonic + SEGMENT_DURATION
     next_segment_index = 1
+    consecutive_errors = 0
     
     while True:
         try:
             # Wait until it's time for the next segment
-            now = time.time()
+            now = time.monotonic()
             if now < next_segment_time:
                 await asyncio.sleep(0.1)
                 continue
@@ -1474,31 +1637,32 @@ async def manage_drip_feed():
             # Schedule next segment
             next_segment_time += SEGMENT_DURATION
             next_segment_index += 1
+            consecutive_errors = 0
             
         except Exception as e:
-            system_logger.error(f"Error in drip feed: {e}")
-            await asyncio.sleep(1)
+            consecutive_errors += 1
+            backoff = min(2 ** (consecutive_errors - 1), SEGMENT_DURATION)
+            system_logger.error(f"Error in drip feed (retrying in {backoff}s): {e}")
+            await asyncio.sleep(backoff)
 
 async def create_serving_master_playlist():
     """Create a master playlist for the serving stream."""
     master_playlist_path = os.path.join(SERVING_DIR, "master.m3u8")
     
-    content = "#EXTM3U\n#EXT-X-VERSION:3\n"
-    content += "#EXT-X-INDEPENDENT-SEGMENTS\n\n"
-    
-    # Audio track
-    content += f'#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="audio",NAME="Audio",DEFAULT=YES,AUTOSELECT=YES,URI="audio/playlist.m3u8"\n\n'
+    content_parts = [
+        "#EXTM3U\n#EXT-X-VERSION:3\n",
+        "#EXT-X-INDEPENDENT-SEGMENTS\n\n",
+        # Audio track
+        '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="audio",NAME="Audio",DEFAULT=YES,AUTOSELECT=YES,URI="audio/playlist.m3u8"\n\n',
+    ]
     
     # Subtitle tracks
-    lang_names = {"ru": "Russian", "en": "English", "nl": "Dutch"}
-    for lang, name in lang_names.items():
-        default = "YES" if lang == "ru" else "NO"
-        content += f'#EXT-X-MEDIA:TYPE=SUBTITLES,GROUP-ID="subs",NAME="{name}",DEFAULT={default},AUTOSELECT=YES,' + \
-                  f'FORCED=NO,LANGUAGE="{lang}",URI="subtitles/{lang}/playlist.m3u8",CHARACTERISTICS="public.accessibility.transcribes-spoken-dialog"\n'
+    content_parts.append(MASTER_PLAYLIST_SUBTITLE_TRACKS)
     
     # Add stream info
-    content += f'\n#EXT-X-STREAM-INF:BANDWIDTH=2500000,CODECS="avc1.64001f,mp4a.40.2,wvtt",AUDIO="audio",SUBTITLES="subs"\n'
-    content += 'video/playlist.m3u8\n'
+    content_parts.append('\n#EXT-X-STREAM-INF:BANDWIDTH=2500000,CODECS="avc1.64001f,mp4a.40.2,wvtt",AUDIO="audio",SUBTITLES="subs"\n')
+    content_parts.append('video/playlist.m3u8\n')
+    content = "".join(content_parts)
     
     await atomic_file_write_with_retry(master_playlist_path, content)
     system_logger.info("Created serving master playlist")
@@ -1536,16 +1700,7 @@ async def update_serving_media_playlists():
 
 def generate_playlist_content(media_type, extension):
     """Generate playlist content based on current serving state."""
-    content = "#EXTM3U\n#EXT-X-VERSION:3\n"
-    content += "#EXT-X-INDEPENDENT-SEGMENTS\n"
-    content += f"#EXT-X-TARGETDURATION:{SEGMENT_DURATION}\n"
-    content += f"#EXT-X-MEDIA-SEQUENCE:{serving_state.media_sequence}\n"
-    
-    for seg_num in serving_state.segments:
-        content += f"#EXTINF:{SEGMENT_DURATION}.0,\n"
-        content += f"segment{seg_num}.{extension}\n"
-    
-    return content
+    return build_media_playlist(serving_state.media_sequence, serving_state.segments, extension)
 
 if __name__ == "__main__":
     # Register signal handlers